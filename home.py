@@ -1,17 +1,28 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 import os
+import time
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image as RLImage
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.utils import ImageReader
 import io
-import random
+
+try:
+    from navigation_utils import add_font_links, load_csv_with_parquet_cache
+except ImportError:
+    def add_font_links():
+        """Without navigation_utils the stylesheet falls back to sans-serif"""
+
+    def load_csv_with_parquet_cache(csv_path, parquet_path, prepare, version):
+        """Without navigation_utils there is no Parquet copy, so read the CSV each time"""
+        return prepare(csv_path)
 
 # ═══════════════════════════════════════════════════════════
 # PAGE CONFIGURATION
@@ -81,10 +92,94 @@ COUNTRY_ISO = {
     'Cape Verde': 'CPV', 'Sao Tome and Principe': 'STP', 'Seychelles': 'SYC'
 }
 
+# ═══════════════════════════════════════════════════════════
+# SEVERITY & THREAT TYPE PALETTES
+# ═══════════════════════════════════════════════════════════
+SEVERITY_LEVELS = ('Critical', 'High', 'Medium', 'Low')
+
+# Severity-specific colors with borders
+SEVERITY_COLORS = {
+    'Critical': '#D32F2F',   # Dark Red
+    'High': '#F57C00',       # Dark Orange
+    'Medium': '#FBC02D',     # Yellow
+    'Low': '#388E3C',        # Green
+    'Unknown': '#757575'     # Gray
+}
+
+# Enhanced color palette for threat types
+THREAT_TYPE_COLORS = {
+    'Ransomware': '#C41E3A',
+    'Phishing': '#FF9800',
+    'DDoS': '#FFEB3B',
+    'Malware': '#00E676',
+    'Data Breach': '#00BCD4',
+    'Database': '#9C27B0',
+    'Credential': '#E91E63',
+    'Vulnerability': '#2196F3',
+    'Defacement': '#FF5722',
+    'Unknown': '#757575'
+}
+
+# Gradient palettes for the ranked bar charts (darkest = highest count)
+RED_GRADIENT = ('#8B0000', '#A52A2A', '#B22222', '#CD5C5C', '#DC143C',
+                '#E74C3C', '#F08080', '#FA8072', '#FFA07A', '#FFB6C1')
+BLUE_GRADIENT = ('#0D47A1', '#1565C0', '#1976D2', '#1E88E5', '#2196F3',
+                 '#42A5F5', '#64B5F6', '#90CAF9', '#BBDEFB', '#E3F2FD')
+GREEN_GRADIENT = ('#1B5E20', '#2E7D32', '#388E3C', '#43A047', '#4CAF50',
+                  '#66BB6A', '#81C784', '#A5D6A7', '#C8E6C9', '#E8F5E9')
+PURPLE_GRADIENT = ('#4A148C', '#6A1B9A', '#7B1FA2', '#8E24AA', '#9C27B0',
+                   '#AB47BC', '#BA68C8', '#CE93D8', '#E1BEE7', '#F3E5F5')
+
+BAR_OUTLINE = dict(color='rgba(0,0,0,0.3)', width=1)
+
+# Theme-independent layout shared by the analytics charts
+CHART_LAYOUT = dict(height=300, margin=dict(l=20, r=20, t=20, b=20), dragmode=False)
+
+# Threat map color stops (mirrored by the legend under the map) and geo setup
+MAP_COLORSCALE = [[0, '#0D47A1'], [0.4, '#00E676'], [0.5, '#FFEB3B'], [0.7, '#FF9800'], [1, '#C41E3A']]
+MAP_LAYOUT = dict(
+    height=650, margin=dict(l=0, r=0, t=0, b=0),
+    geo=dict(
+        scope='africa', projection_type='natural earth',
+        showland=True, showocean=True, showcountries=True,
+        bgcolor='rgba(0,0,0,0)'
+    )
+)
+
+# Lean per-theme Plotly templates. Charts render with theme=None, so each spec
+# carries one of these instead of Streamlit's ~3.7 KB default template
+CHART_TEMPLATES = {
+    name: go.layout.Template(layout=dict(
+        font=dict(family='Inter, sans-serif', color=palette['text']),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor=palette['border'], color=palette['text'], fixedrange=True),
+        yaxis=dict(gridcolor=palette['border'], color=palette['text'], fixedrange=True),
+        hoverlabel=dict(bgcolor=palette['bg_card'], bordercolor=palette['border'],
+                        font=dict(family='Inter, sans-serif', color=palette['text'])),
+        geo=dict(landcolor=palette['bg_elevated'], oceancolor=palette['bg'], countrycolor=palette['border'])
+    ), data=dict(
+        choropleth=[dict(marker=dict(line=dict(color=palette['border'], width=0.5)))]
+    ))
+    for name, palette in THEMES.items()
+}
+
+# Plotly.js config: no toolbar anywhere, and the analytics charts render as static images
+MAP_CONFIG = dict(displayModeBar=False)
+CHART_CONFIG = dict(displayModeBar=False, staticPlot=True)
+
 # ═══════════════════════════════════════════════════════════
 # DATA LOADING
 # ═══════════════════════════════════════════════════════════
-@st.cache_data(ttl=300)
+DATA_TTL = 300  # seconds
+# Parquet copy of clean_incidents() output, kept under data/ (git-ignored);
+# bump the version whenever clean_incidents() changes its columns or dtypes
+INCIDENTS_PARQUET = 'data/incidents.parquet'
+INCIDENTS_PARQUET_VERSION = 2
+CATEGORY_COLUMNS = ('country', 'threat_actor', 'threat_type', 'industry', 'severity')
+MONTHS = ("January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December")
+
+@st.cache_data(ttl=DATA_TTL)
 def load_data():
     """Load incidents data from CSV - REQUIRED"""
     
@@ -122,6 +217,12 @@ def load_data():
         """)
         st.stop()
     
+    return load_csv_with_parquet_cache(csv_path, INCIDENTS_PARQUET, clean_incidents, INCIDENTS_PARQUET_VERSION)
+
+def clean_incidents(csv_path):
+    """Read the incidents CSV into the dashboard's cleaned, typed columns"""
+    warnings = []
+    
     try:
         # Load CSV
         df = pd.read_csv(csv_path)
@@ -176,7 +277,7 @@ def load_data():
         # Check for invalid dates
         invalid_dates = df['date'].isna().sum()
         if invalid_dates > 0:
-            st.warning(f"⚠️ Warning: {invalid_dates} rows have invalid dates and will be removed.")
+            warnings.append(f"⚠️ Warning: {invalid_dates} rows have invalid dates and will be removed.")
         
         df = df.dropna(subset=['date'])
         
@@ -186,8 +287,9 @@ def load_data():
             st.stop()
         
         # Add derived columns
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.strftime('%B')
+        # Integer year/month straight from the datetime fields (no per-row strftime)
+        df['year'] = df['date'].dt.year.astype('int16')
+        df['month'] = df['date'].dt.month.astype('int8')
         
         # Add industry column if missing (it's mapped from 'sector')
         if 'industry' not in df.columns:
@@ -199,12 +301,20 @@ def load_data():
         removed_count = initial_count - len(df)
         
         if removed_count > 0:
-            st.warning(f"⚠️ Warning: Removed {removed_count} rows with missing data.")
+            warnings.append(f"⚠️ Warning: Removed {removed_count} rows with missing data.")
         
         if len(df) == 0:
             st.error("⚠️ **ERROR: No valid data remaining after cleanup!**")
             st.stop()
         
+        # Low-cardinality text columns as categoricals, so filters and counts
+        # compare int codes instead of Python strings. Categories keep the
+        # CSV's order of appearance (see in_appearance_order)
+        for col in CATEGORY_COLUMNS:
+            df[col] = pd.Categorical(df[col], categories=df[col].dropna().unique())
+        
+        df.attrs['load_warnings'] = warnings
+        
       # Data loaded successfully - no message shown
         return df
         
@@ -219,57 +329,298 @@ def load_data():
         """)
         st.stop()
 
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def load_filter_options():
+    """Sorted option lists for the filter row, built once per data load"""
+    df = load_data()
+    # Categories are already unique, but in order of appearance rather than sorted
+    return dict(
+        years=sorted([str(y) for y in df['year'].unique()], reverse=True),
+        countries=sorted(df['country'].cat.categories),
+        types=sorted(df['threat_type'].cat.categories),
+        actors=sorted(df['threat_actor'].cat.categories)
+    )
+
+def in_appearance_order(s):
+    """Categorical s with only the categories it uses, in order of first appearance"""
+    # value_counts() on a categorical breaks count ties in category order, while
+    # on the string column it used order of appearance (the CSV is newest
+    # first); matching that keeps the same values in every top-N list
+    codes = pd.unique(s.cat.codes.to_numpy())
+    return s.cat.set_categories(s.cat.categories[codes[codes >= 0]])
+
 def filter_data(df, year, month, country, threat_type, threat_actor, severity):
     """Apply all filters"""
-    filtered = df.copy()
+    # One combined mask and a single slice, instead of a copy plus a slice per filter
+    mask = np.ones(len(df), dtype=bool)
     
     if year != "All Years":
-        filtered = filtered[filtered['year'] == int(year)]
+        mask &= (df['year'] == int(year)).to_numpy()
     if month != "All Months":
-        filtered = filtered[filtered['month'] == month]
+        mask &= (df['month'] == MONTHS.index(month) + 1).to_numpy()
     if country != "All Countries":
-        filtered = filtered[filtered['country'] == country]
+        mask &= (df['country'] == country).to_numpy()
     if threat_type != "All Types":
-        filtered = filtered[filtered['threat_type'] == threat_type]
+        mask &= (df['threat_type'] == threat_type).to_numpy()
     if threat_actor != "All Actors":
-        filtered = filtered[filtered['threat_actor'] == threat_actor]
+        mask &= (df['threat_actor'] == threat_actor).to_numpy()
     if severity != "All Severities":
-        filtered = filtered[filtered['severity'] == severity]
-    
-    return filtered
+        mask &= (df['severity'] == severity).to_numpy()
+    
+    filtered = df[mask]
+    
+    # Drop the categories the filters removed, so value_counts() and nunique()
+    # on the view only see values that actually occur in it
+    return filtered.assign(**{col: in_appearance_order(filtered[col]) for col in CATEGORY_COLUMNS})
+
+def top_counts_by_country(df, col, n):
+    """The n most frequent values of col per country, highest count first"""
+    # All (country, value) pairs sized in one pass, in order of first appearance.
+    # Each country's slice then gets the same sort value_counts() gives it, so
+    # tied values resolve exactly as a per-country value_counts().head(n) would
+    counts = df.groupby(['country', col], observed=True, sort=False).size()
+    if counts.empty:
+        return counts  # apply() on no groups would drop the (country, value) index
+    return counts.groupby(level=0, observed=True, sort=False, group_keys=False).apply(
+        lambda country_counts: country_counts.sort_values(ascending=False).head(n)
+    )
+
+def hover_lines(counts, title):
+    """Per-country hover block ("title" plus one bullet per value) from (country, value) counts"""
+    lines = pd.Series(
+        "<br>  • " + counts.index.get_level_values(1).astype(str) + ": " + counts.astype(str).to_numpy(),
+        index=counts.index.get_level_values(0).astype(str)
+    )
+    return f"<br><b>{title}:</b>" + lines.groupby(level=0, sort=False).agg("".join)
 
 def process_map_data(df):
     """Process data for map"""
-    map_data = []
-    
-    for country, iso in COUNTRY_ISO.items():
-        country_df = df[df['country'] == country]
-        attacks = len(country_df)
-        
-        top_actors = []
-        if not country_df.empty:
-            for actor, count in country_df['threat_actor'].value_counts().head(5).items():
-                top_actors.append({'name': str(actor), 'count': int(count)})
-        
-        threat_types = []
-        if not country_df.empty:
-            for ttype, count in country_df['threat_type'].value_counts().head(3).items():
-                threat_types.append({'type': str(ttype), 'count': int(count)})
-        
-        map_data.append({
-            'country': country,
-            'iso_alpha': iso,
-            'attacks': attacks,
-            'top_actors': top_actors,
-            'threat_types': threat_types
-        })
+    # Only countries the map can draw, and only the columns it needs, go into the counts
+    df = df.loc[df['country'].isin(COUNTRY_ISO).to_numpy(), ['country', 'threat_actor', 'threat_type']]
+    
+    # Top actors / threat types for every country in one grouped pass each,
+    # instead of two value_counts() calls per country
+    actor_lines = hover_lines(top_counts_by_country(df, 'threat_actor', 5), "Top Actors")
+    type_lines = hover_lines(top_counts_by_country(df, 'threat_type', 3), "Top Threats")
+    
+    # Attack totals from one value_counts() instead of a boolean slice per country
+    attacks_by_country = df['country'].value_counts()
+    attacks_by_country.index = attacks_by_country.index.astype(str)
+    
+    map_df = pd.DataFrame({'country': list(COUNTRY_ISO), 'iso_alpha': list(COUNTRY_ISO.values())})
+    map_df['attacks'] = map_df['country'].map(attacks_by_country).fillna(0).astype(int)
+    # Hover labels assembled column-wise, not with a Python call per country
+    map_df['hover_text'] = (
+        "<b>" + map_df['country'] + "</b><br>Attacks: " + map_df['attacks'].astype(str)
+        + map_df['country'].map(actor_lines).fillna("") + map_df['country'].map(type_lines).fillna("")
+    )
     
-    return pd.DataFrame(map_data)
+    return map_df
+
+def chart_counts(df):
+    """Stat card values and the counts behind the analytics charts, as hashable tuples"""
+    type_counts = tuple(df['threat_type'].value_counts().items())
+    severity_counts = tuple(df['severity'].value_counts().items())
+    sev = dict(severity_counts)
+    ransomware = in_appearance_order(df.loc[df['threat_type'] == 'Ransomware', 'threat_actor'])
+    actors_cnt, countries_cnt = df[['threat_actor', 'country']].nunique()
+    return dict(
+        # Stat card values: total, critical + high, distinct actors, distinct countries
+        stats=(len(df), sev.get('Critical', 0) + sev.get('High', 0), int(actors_cnt), int(countries_cnt)),
+        ransomware=tuple(ransomware.value_counts().head(10).items()),
+        threat_types=type_counts[:10],
+        classification=type_counts,
+        severity=severity_counts,
+        actors=tuple(df['threat_actor'].value_counts().head(10).items()),
+        industries=tuple(df['industry'].value_counts().head(10).items()),
+        # Daily counts as one Series: the index and values feed the trace directly
+        daily=df['date'].dt.normalize().value_counts().sort_index()
+    )
+
+def map_data_key(df):
+    """Content hash of the columns the map is built from, used as its cache key"""
+    return int(pd.util.hash_pandas_object(df[['country', 'threat_actor', 'threat_type']], index=False).sum())
+
+def get_view(df, filters):
+    """Filtered incidents, map data (with its cache key) and chart counts for the current filters"""
+    # Kept in session state so reruns that leave the filters alone (theme
+    # toggle, PDF export) skip filtering and aggregation
+    view = st.session_state.get('home_view')
+    now = time.monotonic()
+    if view is None or view['filters'] != filters or now - view['built'] > DATA_TTL:
+        filtered = filter_data(df, *filters)
+        view = dict(filters=filters, built=now,
+                    filtered_df=filtered, map_df=process_map_data(filtered),
+                    map_key=map_data_key(filtered), counts=chart_counts(filtered))
+        st.session_state.home_view = view
+    return view['filtered_df'], view['map_df'], view['map_key'], view['counts']
+
+# Figures are shared across sessions, one per filter combination and theme;
+# capped so the cache does not keep every combination ever selected
+CHART_CACHE_ENTRIES = 64
+
+@st.cache_resource(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
+def build_map_chart(map_key, _map_df, theme):
+    """Build the Africa threat map, reused across reruns for the same map key and theme"""
+    # The leading underscore keeps _map_df out of the cache key; map_key
+    # already identifies its contents without hashing the hover strings
+    return go.Figure(dict(
+        data=[dict(
+            type='choropleth',
+            locations=_map_df['iso_alpha'], z=_map_df['attacks'], locationmode='ISO-3',
+            colorscale=MAP_COLORSCALE,
+            colorbar=dict(title="Threats"),
+            text=_map_df['hover_text'], hovertemplate='%{text}<extra></extra>'
+        )],
+        layout=dict(MAP_LAYOUT, template=CHART_TEMPLATES[theme])
+    ))
+
+@st.cache_resource(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
+def build_severity_chart(severity_counts, theme):
+    """Build the severity bar chart, reused across reruns for the same counts and theme"""
+    labels, counts = zip(*severity_counts) if severity_counts else ((), ())
+    counts = np.asarray(counts, dtype=np.int32)
+    
+    # Build from one plain spec so Plotly validates it in a single pass
+    # (a raw dict handed to st.plotly_chart would be re-validated by Streamlit)
+    return go.Figure(dict(
+        data=[dict(
+            type='bar',
+            x=labels,
+            y=counts,
+            marker=dict(
+                color=[SEVERITY_COLORS.get(sev, '#999999') for sev in labels],
+                line=BAR_OUTLINE
+            ),
+            hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
+        )],
+        layout=dict(
+            CHART_LAYOUT,
+            template=CHART_TEMPLATES[theme],
+            xaxis=dict(showgrid=False),
+            yaxis=dict(showgrid=True)
+        )
+    ))
+
+@st.cache_resource(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
+def build_ranking_chart(counts, gradient, theme):
+    """Build a horizontal top-N bar chart, reused across reruns for the same counts and theme"""
+    labels, values = zip(*counts) if counts else ((), ())
+    
+    return go.Figure(dict(
+        data=[dict(
+            type='bar',
+            y=labels,
+            x=np.asarray(values, dtype=np.int32),
+            orientation='h',
+            marker=dict(
+                color=gradient[:len(labels)],
+                line=BAR_OUTLINE
+            ),
+            hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
+        )],
+        layout=dict(
+            CHART_LAYOUT,
+            template=CHART_TEMPLATES[theme],
+            xaxis=dict(showgrid=True),
+            yaxis=dict(showgrid=False)
+        )
+    ))
+
+@st.cache_resource(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
+def build_threat_chart(threat_counts, theme):
+    """Build the top threat types bar chart, reused across reruns for the same counts and theme"""
+    labels, values = zip(*threat_counts) if threat_counts else ((), ())
+    
+    return go.Figure(dict(
+        data=[dict(
+            type='bar',
+            x=labels,
+            y=np.asarray(values, dtype=np.int32),
+            marker=dict(
+                color=[THREAT_TYPE_COLORS.get(t, '#999999') for t in labels],
+                line=BAR_OUTLINE
+            ),
+            hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
+        )],
+        layout=dict(
+            CHART_LAYOUT,
+            margin=dict(l=20, r=20, t=20, b=40),
+            template=CHART_TEMPLATES[theme],
+            xaxis=dict(showgrid=False, tickangle=-45),
+            yaxis=dict(showgrid=True)
+        )
+    ))
+
+TIMELINE_MAX_POINTS = 500
+
+def lttb_indices(x, y, n_out):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling to n_out points"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(hi, edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        # Keep the point forming the largest triangle with the last kept point
+        # and the average of the next bucket
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+@st.cache_resource(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
+def build_timeline_chart(daily_counts, theme):
+    """Build the activity timeline, reused across reruns for the same daily counts and theme"""
+    if len(daily_counts) > TIMELINE_MAX_POINTS:
+        x = daily_counts.index.to_numpy().astype(np.int64).astype(float)
+        daily_counts = daily_counts.iloc[lttb_indices(x, daily_counts.to_numpy().astype(float), TIMELINE_MAX_POINTS)]
+    
+    return go.Figure(dict(
+        data=[dict(
+            type='scatter',
+            x=daily_counts.index,
+            y=daily_counts.to_numpy(),
+            mode='lines',
+            line=dict(color='#00BCD4', width=3),  # Cyan line
+            fill='tozeroy',
+            fillcolor='rgba(0, 188, 212, 0.2)',  # Cyan fill
+            hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Count: %{y}<extra></extra>'
+        )],
+        layout=dict(
+            CHART_LAYOUT,
+            height=250,
+            template=CHART_TEMPLATES[theme],
+            xaxis=dict(showgrid=True),
+            yaxis=dict(showgrid=True)
+        )
+    ))
 
 
 # ═══════════════════════════════════════════════════════════
 # PDF EXPORT - COMPREHENSIVE STRATEGIC THREAT INTELLIGENCE REPORT
 # ═══════════════════════════════════════════════════════════
+LOGO_PATH = "assets/cyhawk_logo.png"
+
+@st.cache_resource(show_spinner=False)
+def load_report_logo():
+    """Report logo as PNG bytes, downscaled once per process (the source is 1080x1080)"""
+    if not os.path.exists(LOGO_PATH):
+        return None
+    from PIL import Image
+    img = Image.open(LOGO_PATH)
+    img.thumbnail((240, 240), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
 def add_watermark(canvas, doc):
     """Add CyHawk Africa watermark and logo to every page"""
     canvas.saveState()
@@ -287,9 +638,9 @@ def add_watermark(canvas, doc):
     page_num = canvas.getPageNumber()
     if page_num > 1:
         try:
-            logo_path = "assets/cyhawk_logo.png"
-            if os.path.exists(logo_path):
-                canvas.drawImage(logo_path, 40, A4[1] - 50, width=30, height=30, preserveAspectRatio=True, mask='auto')
+            logo = load_report_logo()
+            if logo:
+                canvas.drawImage(ImageReader(io.BytesIO(logo)), 40, A4[1] - 50, width=30, height=30, preserveAspectRatio=True, mask='auto')
         except:
             pass  # Logo not found, continue without it
     
@@ -315,7 +666,7 @@ def add_watermark(canvas, doc):
     canvas.setFont('Helvetica-Bold', 9)
     canvas.drawCentredString(A4[0]/2, A4[1] - 17, "TLP:WHITE")
 
-def generate_pdf(df, filters):
+def generate_pdf(df, filters, report_date):
     """Generate comprehensive strategic threat intelligence report"""
     buffer = io.BytesIO()
     
@@ -383,9 +734,9 @@ def generate_pdf(df, filters):
     
     # Add logo at top if available
     try:
-        logo_path = "assets/cyhawk_logo.png"
-        if os.path.exists(logo_path):
-            logo = RLImage(logo_path, width=80, height=80)
+        logo_png = load_report_logo()
+        if logo_png:
+            logo = RLImage(io.BytesIO(logo_png), width=80, height=80)
             logo.hAlign = 'CENTER'
             elements.append(logo)
             elements.append(Spacer(1, 20))
@@ -400,7 +751,6 @@ def generate_pdf(df, filters):
     elements.append(Spacer(1, 40))
     
     # Report metadata box
-    report_date = datetime.now().strftime('%B %d, %Y')
     report_period = f"{df['date'].min().strftime('%Y-%m-%d')} to {df['date'].max().strftime('%Y-%m-%d')}"
     
     meta_data = [
@@ -725,16 +1075,47 @@ def generate_pdf(df, filters):
     buffer.seek(0)
     return buffer
 
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def build_pdf_report(df, filters, report_date):
+    """PDF report bytes, reused across export clicks for the same filtered data and date"""
+    return generate_pdf(df, filters, report_date).getvalue()
+
+@st.fragment
+def render_pdf_export(df, filters):
+    """Export footer - button clicks rerun only this fragment, not the whole dashboard"""
+    c_a, c_b = st.columns([3, 1])
+    with c_b:
+        if st.button("Export PDF Report", type="primary", use_container_width=True):
+            # Date stamped here, not in the cached builder, so a report cached
+            # before midnight is not handed out with yesterday's date
+            pdf_bytes = build_pdf_report(df, filters, datetime.now().strftime('%B %d, %Y'))
+            st.download_button(
+                "Download PDF",
+                data=pdf_bytes,
+                file_name=f"cyhawk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+
 # Load data
 df = load_data()
+# Cleanup warnings travel with the frame, so a load from the Parquet copy shows
+# them too; shown here rather than inside a cached function, where every cached
+# caller of load_data() would replay them
+for warning in df.attrs.get('load_warnings', []):
+    st.warning(warning)
 
 # ═══════════════════════════════════════════════════════════
 # CSS STYLING
 # ═══════════════════════════════════════════════════════════
-st.markdown(f"""
+# cache_resource hands back the cached string itself; the CSS is immutable,
+# so there is nothing to gain from cache_data's per-call unpickled copy
+@st.cache_resource(show_spinner=False)
+def build_css(theme):
+    """Dashboard stylesheet - formatted once per theme instead of on every rerun"""
+    C = THEMES[theme]
+    return f"""
 <style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
-
 * {{ font-family: 'Inter', sans-serif; -webkit-font-smoothing: antialiased; }}
 .stApp {{ background: {C['bg']}; color: {C['text']}; }}
 #MainMenu, footer, header {{ visibility: hidden; }}
@@ -843,7 +1224,7 @@ st.markdown(f"""
 
 .hero-subtitle {{ font-size: 1.25rem; color: {C['text_dim']}; margin-bottom: 2rem; }}
 
-.map-container {{
+.st-key-map-container {{
     background: linear-gradient(135deg, {C['bg_card']} 0%, {C['bg_elevated']} 100%);
     border: 1px solid {C['border']}; border-radius: 24px;
     padding: 3rem; margin-bottom: 2rem; position: relative; overflow: hidden;
@@ -886,13 +1267,13 @@ st.markdown(f"""
 }}
 .section-title {{ font-size: 2rem; font-weight: 700; }}
 
-.chart-card {{
+[class*="st-key-chart-card-"] {{
     background: {C['bg_card']}; border: 1px solid {C['border']};
     border-radius: 20px; padding: 2rem; margin-bottom: 2rem;
     transition: all 0.3s;
 }}
 
-.chart-card:hover {{ border-color: rgba(196, 30, 58, 0.5); }}
+[class*="st-key-chart-card-"]:hover {{ border-color: rgba(196, 30, 58, 0.5); }}
 
 .chart-header {{
     display: flex; justify-content: space-between;
@@ -908,7 +1289,7 @@ st.markdown(f"""
     text-transform: uppercase; letter-spacing: 1px;
 }}
 
-.filter-container {{
+.st-key-filter-container {{
     background: {C['bg_card']}; border: 1px solid {C['border']};
     border-radius: 16px; padding: 1.5rem; margin-bottom: 2rem;
 }}
@@ -963,11 +1344,15 @@ st.markdown(f"""
     }}
 }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+add_font_links()
+st.html(build_css(st.session_state.theme))
 
 # ═══════════════════════════════════════════════════════════
-# HEADER
+# HEADER & HERO
 # ═══════════════════════════════════════════════════════════
+# One markdown block for both, so the page mounts a single element here
 st.markdown(f"""
 <div class="main-header">
     <div class="logo-section">
@@ -988,15 +1373,6 @@ st.markdown(f"""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
-
-
-# ═══════════════════════════════════════════════════════════
-# HERO
-# ═══════════════════════════════════════════════════════════
-st.markdown('<div style="max-width: 1400px; margin: 0 auto; padding: 0 2rem;">', unsafe_allow_html=True)
-
-st.markdown(f"""
 <div class="hero-label">CONTINENTAL INTELLIGENCE</div>
 <h1 class="hero-title">Africa Threat Landscape</h1>
 <p class="hero-subtitle">Real-time cyber threat monitoring across African nations</p>
@@ -1005,123 +1381,16 @@ st.markdown(f"""
 # Theme toggle button in header
 col1, col2, col3 = st.columns([6, 1, 1])
 with col3:
-    if st.button("🌓", use_container_width=True, key="theme_toggle_home"):
-        toggle_theme()
-        st.rerun()
-        
-# ═══════════════════════════════════════════════════════════
-# FILTERS
-# ═══════════════════════════════════════════════════════════
-st.markdown('<div class="filter-container">', unsafe_allow_html=True)
-
-c1, c2, c3, c4, c5, c6 = st.columns(6)
-
-with c1:
-    years = ["All Years"] + sorted([str(y) for y in df['year'].unique()], reverse=True)
-    year = st.selectbox("Year", years)
-
-with c2:
-    months = ["All Months", "January", "February", "March", "April", "May", "June",
-              "July", "August", "September", "October", "November", "December"]
-    month = st.selectbox("Month", months)
-
-with c3:
-    countries = ["All Countries"] + sorted(df['country'].unique().tolist())
-    country = st.selectbox("Country", countries)
-
-with c4:
-    types = ["All Types"] + sorted(df['threat_type'].unique().tolist())
-    threat_type = st.selectbox("Threat Type", types)
-
-with c5:
-    actors = ["All Actors"] + sorted(df['threat_actor'].unique().tolist())
-    actor = st.selectbox("Threat Actor", actors)
-
-with c6:
-    sevs = ["All Severities", "Critical", "High", "Medium", "Low"]
-    severity = st.selectbox("Severity", sevs)
-
-st.markdown('</div>', unsafe_allow_html=True)
-
-filtered_df = filter_data(df, year, month, country, threat_type, actor, severity)
+    # on_click flips the theme before the rerun the click already triggers,
+    # so the page is rendered once in the new theme instead of twice
+    st.button("🌓", use_container_width=True, key="theme_toggle_home", on_click=toggle_theme)
 
 # ═══════════════════════════════════════════════════════════
-# AFRICA MAP
+# STAT CARD MARKUP
 # ═══════════════════════════════════════════════════════════
-map_df = process_map_data(filtered_df)
-
-st.markdown('<div class="map-container">', unsafe_allow_html=True)
-
-hover_texts = []
-for _, row in map_df.iterrows():
-    actors_txt = ""
-    if row['top_actors']:
-        actors_txt = "<br><b>Top Actors:</b>"
-        for a in row['top_actors'][:5]:
-            actors_txt += f"<br>  • {a['name']}: {a['count']}"
-    
-    types_txt = ""
-    if row['threat_types']:
-        types_txt = "<br><b>Top Threats:</b>"
-        for t in row['threat_types'][:3]:
-            types_txt += f"<br>  • {t['type']}: {t['count']}"
-    
-    hover_texts.append(f"<b>{row['country']}</b><br>Attacks: {row['attacks']}{actors_txt}{types_txt}")
-
-fig = go.Figure(go.Choropleth(
-    locations=map_df['iso_alpha'], z=map_df['attacks'], locationmode='ISO-3',
-    colorscale=[[0, '#0D47A1'], [0.4, '#00E676'], [0.5, '#FFEB3B'], [0.7, '#FF9800'], [1, '#C41E3A']],
-    marker=dict(line=dict(color=C['border'], width=0.5)),
-    colorbar=dict(title="Threats", titlefont=dict(color=C['text']), tickfont=dict(color=C['text'])),
-    text=hover_texts, hovertemplate='%{text}<extra></extra>'
-))
-
-fig.update_geos(
-    scope='africa', projection_type='natural earth',
-    showland=True, landcolor=C['bg_elevated'],
-    showocean=True, oceancolor=C['bg'],
-    showcountries=True, countrycolor=C['border'], bgcolor=C['bg_card']
-)
-
-fig.update_layout(
-    height=650, margin=dict(l=0, r=0, t=0, b=0),
-    paper_bgcolor='rgba(0,0,0,0)', geo=dict(bgcolor='rgba(0,0,0,0)'),
-    font=dict(color=C['text'])
-)
-
-st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-st.markdown('</div>', unsafe_allow_html=True)
-
-# ═══════════════════════════════════════════════════════════
-# STATS
-# ═══════════════════════════════════════════════════════════
-total = len(filtered_df)
-crit_high = len(filtered_df[filtered_df['severity'].isin(['Critical', 'High'])])
-actors_cnt = filtered_df['threat_actor'].nunique()
-countries_cnt = filtered_df['country'].nunique()
-
-st.markdown(f"""
-<div class="stats-grid">
-    <div class="stat-card">
-        <div class="stat-value">{total}</div>
-        <div class="stat-label">Total Threats</div>
-    </div>
-    <div class="stat-card">
-        <div class="stat-value">{crit_high}</div>
-        <div class="stat-label">Critical & High</div>
-    </div>
-    <div class="stat-card">
-        <div class="stat-value">{actors_cnt}</div>
-        <div class="stat-label">Threat Actors</div>
-    </div>
-    <div class="stat-card">
-        <div class="stat-value">{countries_cnt}</div>
-        <div class="stat-label">Countries</div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
-st.markdown(f"""
+# One template for the four stat cards; the map legend is static markup
+STAT_CARD_HTML = '<div class="stat-card"><div class="stat-value">{value}</div><div class="stat-label">{label}</div></div>'
+LEGEND_HTML = """
 <div class="legend">
     <div class="legend-item"><div class="legend-dot" style="background: #0D47A1;"></div><span>Safe</span></div>
     <div class="legend-item"><div class="legend-dot" style="background: #00E676;"></div><span>Low</span></div>
@@ -1129,350 +1398,203 @@ st.markdown(f"""
     <div class="legend-item"><div class="legend-dot" style="background: #FF9800;"></div><span>High</span></div>
     <div class="legend-item"><div class="legend-dot" style="background: #C41E3A;"></div><span>Critical</span></div>
 </div>
-""", unsafe_allow_html=True)
-
-# ═══════════════════════════════════════════════════════════
-# ANALYTICS SECTION 1: TOP RANSOMWARE & THREATS
-# ═══════════════════════════════════════════════════════════
-st.markdown(f"""
-<div class="section-header">
-    <div class="section-label">ANALYSIS</div>
-    <h2 class="section-title">Threat Intelligence</h2>
-</div>
-""", unsafe_allow_html=True)
+"""
 
-col1, col2 = st.columns(2)
+STAT_LABELS = ('Total Threats', 'Critical & High', 'Threat Actors', 'Countries')
 
-with col1:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-    st.markdown(f"""
-    <div class="chart-header">
-        <h3 class="chart-title">Top Ransomware Groups</h3>
-        <span class="chart-badge">Ransomware Activity</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    ransomware_df = filtered_df[filtered_df['threat_type'] == 'Ransomware']
-    ransomware_actors = ransomware_df['threat_actor'].value_counts().head(10)
-    
-    # Gradient colors from dark red to light red
-    colors_list = ['#8B0000', '#A52A2A', '#B22222', '#CD5C5C', '#DC143C', 
-                   '#E74C3C', '#F08080', '#FA8072', '#FFA07A', '#FFB6C1']
-    
-    fig1 = go.Figure(go.Bar(
-        y=ransomware_actors.index,
-        x=ransomware_actors.values,
-        orientation='h',
-        marker=dict(
-            color=colors_list[:len(ransomware_actors)],
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
-    ))
-    
-    fig1.update_layout(
-        height=300, margin=dict(l=20, r=20, t=20, b=20),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-        yaxis=dict(gridcolor=C['border'], showgrid=False, color=C['text'], fixedrange=True),
-        font=dict(color=C['text']),
-        dragmode=False
-    )
-    
-    st.plotly_chart(fig1, use_container_width=True, config={
-        'displayModeBar': False,
-        'staticPlot': True
-    })
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with col2:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-    st.markdown(f"""
-    <div class="chart-header">
-        <h3 class="chart-title">Top Threats</h3>
-        <span class="chart-badge">Threat Type Breakdown</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    threat_counts = filtered_df['threat_type'].value_counts().head(10)
-    
-    # Enhanced color palette for threat types
-    colors_map = {
-        'Ransomware': '#C41E3A',
-        'Phishing': '#FF9800', 
-        'DDoS': '#FFEB3B',
-        'Malware': '#00E676',
-        'Data Breach': '#00BCD4',
-        'Database': '#9C27B0',
-        'Credential': '#E91E63',
-        'Vulnerability': '#2196F3',
-        'Defacement': '#FF5722',
-        'Unknown': '#757575'
-    }
-    bar_colors = [colors_map.get(t, '#999999') for t in threat_counts.index]
-    
-    fig2 = go.Figure(go.Bar(
-        x=threat_counts.index,
-        y=threat_counts.values,
-        marker=dict(
-            color=bar_colors,
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
-    ))
-    
-    fig2.update_layout(
-        height=300, margin=dict(l=20, r=20, t=20, b=40),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor=C['border'], showgrid=False, color=C['text'], tickangle=-45, fixedrange=True),
-        yaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-        font=dict(color=C['text']),
-        dragmode=False
-    )
-    
-    st.plotly_chart(fig2, use_container_width=True, config={
-        'displayModeBar': False,
-        'staticPlot': True
-    })
-    st.markdown('</div>', unsafe_allow_html=True)
+def stats_html(stats):
+    """Stat cards and legend markup for one set of stat values"""
+    stat_cards = "".join(STAT_CARD_HTML.format(value=value, label=label) for value, label in zip(stats, STAT_LABELS))
+    return f'<div class="stats-grid">{stat_cards}</div>{LEGEND_HTML}'
 
 # ═══════════════════════════════════════════════════════════
-# ANALYTICS SECTION 2: CLASSIFICATION & SEVERITY
+# DASHBOARD BODY
 # ═══════════════════════════════════════════════════════════
-col3, col4 = st.columns(2)
+@st.fragment
+def render_dashboard(df):
+    """Filters and everything they drive - a filter change reruns only this fragment"""
+    # ═══════════════════════════════════════════════════════════
+    # FILTERS
+    # ═══════════════════════════════════════════════════════════
+    # Keyed container, so the .st-key-filter-container card actually wraps the selectboxes
+    with st.container(key="filter-container"):
+        options = load_filter_options()
+
+        c1, c2, c3, c4, c5, c6 = st.columns(6)
+
+        with c1:
+            years = ["All Years", *options['years']]
+            year = st.selectbox("Year", years)
+
+        with c2:
+            month = st.selectbox("Month", ["All Months", *MONTHS])
+
+        with c3:
+            countries = ["All Countries", *options['countries']]
+            country = st.selectbox("Country", countries)
+
+        with c4:
+            types = ["All Types", *options['types']]
+            threat_type = st.selectbox("Threat Type", types)
+
+        with c5:
+            actors = ["All Actors", *options['actors']]
+            actor = st.selectbox("Threat Actor", actors)
+
+        with c6:
+            sevs = ["All Severities", *SEVERITY_LEVELS]
+            severity = st.selectbox("Severity", sevs)
+
+    filtered_df, map_df, map_key, counts = get_view(df, (year, month, country, threat_type, actor, severity))
+
+    # ═══════════════════════════════════════════════════════════
+    # AFRICA MAP
+    # ═══════════════════════════════════════════════════════════
+    with st.container(key="map-container"):
+        fig = build_map_chart(map_key, map_df, st.session_state.theme)
+        
+        st.plotly_chart(fig, width="stretch", theme=None, config=MAP_CONFIG, key="chart-map")
 
-with col3:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-    st.markdown(f"""
-    <div class="chart-header">
-        <h3 class="chart-title">Threat Classification</h3>
-        <span class="chart-badge">By Type</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    class_counts = filtered_df['threat_type'].value_counts()
-    
-    # Blue gradient colors
-    blue_colors = ['#0D47A1', '#1565C0', '#1976D2', '#1E88E5', '#2196F3',
-                   '#42A5F5', '#64B5F6', '#90CAF9', '#BBDEFB', '#E3F2FD']
-    
-    fig3 = go.Figure(go.Bar(
-        y=class_counts.index,
-        x=class_counts.values,
-        orientation='h',
-        marker=dict(
-            color=blue_colors[:len(class_counts)],
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
-    ))
-    
-    fig3.update_layout(
-        height=300, margin=dict(l=20, r=20, t=20, b=20),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-        yaxis=dict(gridcolor=C['border'], showgrid=False, color=C['text'], fixedrange=True),
-        font=dict(color=C['text']),
-        dragmode=False
-    )
-    
-    st.plotly_chart(fig3, use_container_width=True, config={
-        'displayModeBar': False,
-        'staticPlot': True
-    })
-    st.markdown('</div>', unsafe_allow_html=True)
+    # ═══════════════════════════════════════════════════════════
+    # STATS
+    # ═══════════════════════════════════════════════════════════
+    st.markdown(stats_html(counts['stats']), unsafe_allow_html=True)
 
-with col4:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+    # ═══════════════════════════════════════════════════════════
+    # ANALYTICS SECTION 1: TOP RANSOMWARE & THREATS
+    # ═══════════════════════════════════════════════════════════
     st.markdown(f"""
-    <div class="chart-header">
-        <h3 class="chart-title">Severity Analysis</h3>
-        <span class="chart-badge">Impact Level</span>
+    <div class="section-header">
+        <div class="section-label">ANALYSIS</div>
+        <h2 class="section-title">Threat Intelligence</h2>
     </div>
     """, unsafe_allow_html=True)
-    
-    sev_counts = filtered_df['severity'].value_counts()
-    
-    # Severity-specific colors with borders
-    sev_colors = {
-        'Critical': '#D32F2F',   # Dark Red
-        'High': '#F57C00',       # Dark Orange  
-        'Medium': '#FBC02D',     # Yellow
-        'Low': '#388E3C',        # Green
-        'Unknown': '#757575'     # Gray
-    }
-    sev_bar_colors = [sev_colors.get(s, '#999999') for s in sev_counts.index]
-    
-    fig4 = go.Figure(go.Bar(
-        x=sev_counts.index,
-        y=sev_counts.values,
-        marker=dict(
-            color=sev_bar_colors,
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
-    ))
-    
-    fig4.update_layout(
-        height=300, margin=dict(l=20, r=20, t=20, b=20),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor=C['border'], showgrid=False, color=C['text'], fixedrange=True),
-        yaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-        font=dict(color=C['text']),
-        dragmode=False
-    )
-    
-    st.plotly_chart(fig4, use_container_width=True, config={
-        'displayModeBar': False,
-        'staticPlot': True
-    })
-    st.markdown('</div>', unsafe_allow_html=True)
-
-# ═══════════════════════════════════════════════════════════
-# ANALYTICS SECTION 3: TIMELINE
-# ═══════════════════════════════════════════════════════════
-st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-st.markdown(f"""
-<div class="chart-header">
-    <h3 class="chart-title">Activity Timeline</h3>
-    <span class="chart-badge">Historical Trend</span>
-</div>
-""", unsafe_allow_html=True)
 
-timeline_df = filtered_df.groupby(filtered_df['date'].dt.to_period('D')).size().reset_index(name='count')
-timeline_df['date'] = timeline_df['date'].dt.to_timestamp()
-
-fig5 = go.Figure(go.Scatter(
-    x=timeline_df['date'],
-    y=timeline_df['count'],
-    mode='lines',
-    line=dict(color='#00BCD4', width=3),  # Cyan line
-    fill='tozeroy',
-    fillcolor='rgba(0, 188, 212, 0.2)',  # Cyan fill
-    hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Count: %{y}<extra></extra>'
-))
-
-fig5.update_layout(
-    height=250, margin=dict(l=20, r=20, t=20, b=20),
-    paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-    xaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-    yaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-    font=dict(color=C['text']),
-    dragmode=False
-)
-
-st.plotly_chart(fig5, use_container_width=True, config={
-    'displayModeBar': False,
-    'staticPlot': True
-})
-st.markdown('</div>', unsafe_allow_html=True)
-
-# ═══════════════════════════════════════════════════════════
-# ANALYTICS SECTION 4: ACTORS & INDUSTRIES
-# ═══════════════════════════════════════════════════════════
-col5, col6 = st.columns(2)
-
-with col5:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-    st.markdown(f"""
-    <div class="chart-header">
-        <h3 class="chart-title">Top Threat Actors</h3>
-        <span class="chart-badge">Most Active</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    top_actors = filtered_df['threat_actor'].value_counts().head(10)
-    
-    # Green gradient colors
-    green_colors = ['#1B5E20', '#2E7D32', '#388E3C', '#43A047', '#4CAF50',
-                    '#66BB6A', '#81C784', '#A5D6A7', '#C8E6C9', '#E8F5E9']
-    
-    fig6 = go.Figure(go.Bar(
-        y=top_actors.index,
-        x=top_actors.values,
-        orientation='h',
-        marker=dict(
-            color=green_colors[:len(top_actors)],
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
-    ))
-    
-    fig6.update_layout(
-        height=300, margin=dict(l=20, r=20, t=20, b=20),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-        yaxis=dict(gridcolor=C['border'], showgrid=False, color=C['text'], fixedrange=True),
-        font=dict(color=C['text']),
-        dragmode=False
+    # Each card is a keyed container (.st-key-chart-card-*), so its border wraps
+    # the chart as well as the header
+    # Charts carry their own keys too: two identical figures (e.g. empty
+    # rankings for a filter with no matches) would otherwise share an element ID
+    col1, col2 = st.columns(2)
+
+    with col1:
+        with st.container(key="chart-card-ransomware"):
+            st.markdown(f"""
+            <div class="chart-header">
+                <h3 class="chart-title">Top Ransomware Groups</h3>
+                <span class="chart-badge">Ransomware Activity</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+            fig1 = build_ranking_chart(counts['ransomware'], RED_GRADIENT, st.session_state.theme)
+        
+            st.plotly_chart(fig1, width="stretch", theme=None, config=CHART_CONFIG, key="chart-ransomware")
+
+    with col2:
+        with st.container(key="chart-card-threats"):
+            st.markdown(f"""
+            <div class="chart-header">
+                <h3 class="chart-title">Top Threats</h3>
+                <span class="chart-badge">Threat Type Breakdown</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+            fig2 = build_threat_chart(counts['threat_types'], st.session_state.theme)
+        
+            st.plotly_chart(fig2, width="stretch", theme=None, config=CHART_CONFIG, key="chart-threats")
+
+    # ═══════════════════════════════════════════════════════════
+    # ANALYTICS SECTIONS 2-4: TABS (ONLY THE OPEN TAB RUNS)
+    # ═══════════════════════════════════════════════════════════
+    tab_classification, tab_timeline, tab_actors = st.tabs(
+        ["Classification & Severity", "Activity Timeline", "Actors & Industries"],
+        key="home_analytics_tab",
+        on_change="rerun",
     )
-    
-    st.plotly_chart(fig6, use_container_width=True, config={
-        'displayModeBar': False,
-        'staticPlot': True
-    })
-    st.markdown('</div>', unsafe_allow_html=True)
 
-with col6:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-    st.markdown(f"""
-    <div class="chart-header">
-        <h3 class="chart-title">Most Targeted Industries</h3>
-        <span class="chart-badge">Sector Analysis</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    industries = filtered_df['industry'].value_counts().head(10)
-    
-    # Purple gradient colors
-    purple_colors = ['#4A148C', '#6A1B9A', '#7B1FA2', '#8E24AA', '#9C27B0',
-                     '#AB47BC', '#BA68C8', '#CE93D8', '#E1BEE7', '#F3E5F5']
-    
-    fig7 = go.Figure(go.Bar(
-        y=industries.index,
-        x=industries.values,
-        orientation='h',
-        marker=dict(
-            color=purple_colors[:len(industries)],
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
-    ))
-    
-    fig7.update_layout(
-        height=300, margin=dict(l=20, r=20, t=20, b=20),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor=C['border'], showgrid=True, color=C['text'], fixedrange=True),
-        yaxis=dict(gridcolor=C['border'], showgrid=False, color=C['text'], fixedrange=True),
-        font=dict(color=C['text']),
-        dragmode=False
-    )
-    
-    st.plotly_chart(fig7, use_container_width=True, config={
-        'displayModeBar': False,
-        'staticPlot': True
+    # Classification & Severity
+    if tab_classification.open:
+        with tab_classification:
+            col3, col4 = st.columns(2)
+
+            with col3:
+                with st.container(key="chart-card-classification"):
+                    st.markdown(f"""
+                    <div class="chart-header">
+                        <h3 class="chart-title">Threat Classification</h3>
+                        <span class="chart-badge">By Type</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                    fig3 = build_ranking_chart(counts['classification'], BLUE_GRADIENT, st.session_state.theme)
+                
+                    st.plotly_chart(fig3, width="stretch", theme=None, config=CHART_CONFIG, key="chart-classification")
+
+            with col4:
+                with st.container(key="chart-card-severity"):
+                    st.markdown(f"""
+                    <div class="chart-header">
+                        <h3 class="chart-title">Severity Analysis</h3>
+                        <span class="chart-badge">Impact Level</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                    fig4 = build_severity_chart(counts['severity'], st.session_state.theme)
+                
+                    st.plotly_chart(fig4, width="stretch", theme=None, config=CHART_CONFIG, key="chart-severity")
+
+    # Timeline
+    if tab_timeline.open:
+        with tab_timeline:
+            with st.container(key="chart-card-timeline"):
+                st.markdown(f"""
+                <div class="chart-header">
+                    <h3 class="chart-title">Activity Timeline</h3>
+                    <span class="chart-badge">Historical Trend</span>
+                </div>
+                """, unsafe_allow_html=True)
+
+                fig5 = build_timeline_chart(counts['daily'], st.session_state.theme)
+
+                st.plotly_chart(fig5, width="stretch", theme=None, config=CHART_CONFIG, key="chart-timeline")
+
+    # Actors & Industries
+    if tab_actors.open:
+        with tab_actors:
+            col5, col6 = st.columns(2)
+
+            with col5:
+                with st.container(key="chart-card-actors"):
+                    st.markdown(f"""
+                    <div class="chart-header">
+                        <h3 class="chart-title">Top Threat Actors</h3>
+                        <span class="chart-badge">Most Active</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                    fig6 = build_ranking_chart(counts['actors'], GREEN_GRADIENT, st.session_state.theme)
+                
+                    st.plotly_chart(fig6, width="stretch", theme=None, config=CHART_CONFIG, key="chart-actors")
+
+            with col6:
+                with st.container(key="chart-card-industries"):
+                    st.markdown(f"""
+                    <div class="chart-header">
+                        <h3 class="chart-title">Most Targeted Industries</h3>
+                        <span class="chart-badge">Sector Analysis</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                    fig7 = build_ranking_chart(counts['industries'], PURPLE_GRADIENT, st.session_state.theme)
+                
+                    st.plotly_chart(fig7, width="stretch", theme=None, config=CHART_CONFIG, key="chart-industries")
+
+    # ═══════════════════════════════════════════════════════════
+    # PDF EXPORT
+    # ═══════════════════════════════════════════════════════════
+    st.markdown("---")
+    render_pdf_export(filtered_df, {
+        'Year': year, 'Month': month, 'Country': country,
+        'Type': threat_type, 'Actor': actor, 'Severity': severity
     })
-    st.markdown('</div>', unsafe_allow_html=True)
-
-# ═══════════════════════════════════════════════════════════
-# PDF EXPORT
-# ═══════════════════════════════════════════════════════════
-st.markdown("---")
-c_a, c_b = st.columns([3, 1])
-with c_b:
-    if st.button("Export PDF Report", type="primary", use_container_width=True):
-        filters_applied = {
-            'Year': year, 'Month': month, 'Country': country,
-            'Type': threat_type, 'Actor': actor, 'Severity': severity
-        }
-        pdf_buf = generate_pdf(filtered_df, filters_applied)
-        st.download_button(
-            "Download PDF",
-            data=pdf_buf,
-            file_name=f"cyhawk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-            mime="application/pdf",
-            use_container_width=True
-        )
 
-# Close content wrapper
-st.markdown('</div>', unsafe_allow_html=True)
+render_dashboard(df)
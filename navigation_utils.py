@@ -3,113 +3,163 @@ Navigation and Branding Utilities for CyHawk Africa Dashboard
 Add this file to your repository root
 """
 
+import os
+
+import pandas as pd
 import streamlit as st
+import plotly.io as pio
+
+# Serialize figures with orjson (C encoder) instead of Plotly's pure-Python one,
+# for every page at once since they all import this module
+try:
+    pio.json.config.default_engine = 'orjson'
+except ValueError:
+    pass  # orjson not installed, keep Plotly's default encoder
+
+# Inter font via <link> tags, so the browser can preconnect and fetch it in
+# parallel instead of chaining an @import behind the style block
+FONT_LINKS = (
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    '<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap">'
+)
+
+# Static branding markup shared by every page that calls add_logo_and_branding()
+BRANDING_CSS = """
+<style>
+/* Hide default Streamlit branding */
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+
+/* Custom logo styling */
+[data-testid="stSidebar"] {
+    background-color: #0D1117;
+}
+
+/* Logo container */
+.logo-container {
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    padding: 1.5rem 1rem;
+    margin-bottom: 2rem;
+    border-bottom: 2px solid #30363D;
+}
+
+.logo-link {
+    text-decoration: none;
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    gap: 0.5rem;
+    transition: transform 0.3s ease;
+}
+
+.logo-link:hover {
+    transform: scale(1.05);
+}
+
+.logo-text {
+    font-size: 1.5rem;
+    font-weight: 800;
+    background: linear-gradient(135deg, #C41E3A 0%, #9A1529 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+    letter-spacing: -0.5px;
+}
+
+.logo-subtitle {
+    font-size: 0.7rem;
+    color: #8B949E;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+/* Rename "app" to "Home" */
+[data-testid="stSidebarNav"] li:first-child a span {
+    display: none;
+}
+
+[data-testid="stSidebarNav"] li:first-child a::after {
+    content: "Home";
+    font-weight: 600;
+}
+
+/* Navigation styling */
+[data-testid="stSidebarNav"] {
+    padding-top: 0;
+}
+
+[data-testid="stSidebarNav"] a {
+    background-color: transparent;
+    border-radius: 8px;
+    padding: 0.75rem 1rem;
+    margin: 0.25rem 0;
+    transition: all 0.3s ease;
+}
+
+[data-testid="stSidebarNav"] a:hover {
+    background-color: #1C2128;
+    border-left: 3px solid #C41E3A;
+}
+
+[data-testid="stSidebarNav"] a[aria-current="page"] {
+    background-color: #1C2128;
+    border-left: 3px solid #C41E3A;
+    font-weight: 600;
+}
+</style>
+"""
+
+SIDEBAR_LOGO_HTML = """
+<div class="logo-container">
+    <a href="https://cyhawk-africa.com" target="_blank" class="logo-link">
+        <div class="logo-text">CYHAWK AFRICA</div>
+        <div class="logo-subtitle">Threat Intelligence</div>
+    </a>
+</div>
+"""
 
 def add_logo_and_branding():
     """Add clickable logo and custom branding to the sidebar"""
-    st.markdown(
-        """
-        <style>
-        /* Hide default Streamlit branding */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        
-        /* Custom logo styling */
-        [data-testid="stSidebar"] {
-            background-color: #0D1117;
-        }
-        
-        /* Logo container */
-        .logo-container {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            padding: 1.5rem 1rem;
-            margin-bottom: 2rem;
-            border-bottom: 2px solid #30363D;
-        }
-        
-        .logo-link {
-            text-decoration: none;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            gap: 0.5rem;
-            transition: transform 0.3s ease;
-        }
-        
-        .logo-link:hover {
-            transform: scale(1.05);
-        }
-        
-        .logo-text {
-            font-size: 1.5rem;
-            font-weight: 800;
-            background: linear-gradient(135deg, #C41E3A 0%, #9A1529 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            letter-spacing: -0.5px;
-        }
-        
-        .logo-subtitle {
-            font-size: 0.7rem;
-            color: #8B949E;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        /* Rename "app" to "Home" */
-        [data-testid="stSidebarNav"] li:first-child a span {
-            display: none;
-        }
-        
-        [data-testid="stSidebarNav"] li:first-child a::after {
-            content: "Home";
-            font-weight: 600;
-        }
-        
-        /* Navigation styling */
-        [data-testid="stSidebarNav"] {
-            padding-top: 0;
-        }
-        
-        [data-testid="stSidebarNav"] a {
-            background-color: transparent;
-            border-radius: 8px;
-            padding: 0.75rem 1rem;
-            margin: 0.25rem 0;
-            transition: all 0.3s ease;
-        }
-        
-        [data-testid="stSidebarNav"] a:hover {
-            background-color: #1C2128;
-            border-left: 3px solid #C41E3A;
-        }
-        
-        [data-testid="stSidebarNav"] a[aria-current="page"] {
-            background-color: #1C2128;
-            border-left: 3px solid #C41E3A;
-            font-weight: 600;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    # Style-only block through st.html, like the pages' own stylesheets:
+    # it skips the markdown renderer and takes no slot in the page layout
+    st.html(BRANDING_CSS)
     
     # Add clickable logo to sidebar
     with st.sidebar:
-        st.markdown(
-            """
-            <div class="logo-container">
-                <a href="https://cyhawk-africa.com" target="_blank" class="logo-link">
-                    <div class="logo-text">CYHAWK AFRICA</div>
-                    <div class="logo-subtitle">Threat Intelligence</div>
-                </a>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(SIDEBAR_LOGO_HTML, unsafe_allow_html=True)
+
+def add_font_links():
+    """Load the Inter font that every page's stylesheet uses"""
+    st.markdown(FONT_LINKS, unsafe_allow_html=True)
+
+def load_csv_with_parquet_cache(csv_path, parquet_path, prepare, version):
+    """Return prepare(csv_path), cached in the Parquet file parquet_path
+
+    The Parquet copy (pyarrow ships with Streamlit) is used while it is at
+    least as new as the CSV and was written from the same CSV by the same
+    version of prepare(), so cold starts skip the parse and cleanup. Callers
+    bump version whenever prepare() changes its columns or dtypes. The tag is
+    kept in the frame's attrs, which to_parquet() stores together with
+    anything else prepare() put there.
+    """
+    tag = [os.path.abspath(csv_path), version]
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        try:
+            df = pd.read_parquet(parquet_path)
+            if df.attrs.get('parquet_cache') == tag:
+                return df
+        except Exception:
+            pass  # Unreadable sidecar, rebuild it from the CSV below
+    df = prepare(csv_path)
+    df.attrs['parquet_cache'] = tag
+    try:
+        df.to_parquet(parquet_path)
+    except Exception:
+        pass  # Read-only data directory, keep loading from the CSV
+    return df
 
 def set_page_config(page_title="CyHawk Africa Dashboard", page_icon="🔒", layout="wide"):
     """Set consistent page configuration across all pages"""
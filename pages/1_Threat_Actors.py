@@ -6,7 +6,7 @@ import requests
 
 # Import navigation utilities
 try:
-    from navigation_utils import add_logo_and_branding, set_page_config as custom_set_page_config
+    from navigation_utils import add_logo_and_branding, load_csv_with_parquet_cache, set_page_config as custom_set_page_config
     custom_set_page_config(
         page_title="Threat Actor Intelligence | CyHawk Africa",
         page_icon="assets/favicon.ico",
@@ -20,6 +20,10 @@ except ImportError:
         layout="wide"
     )
 
+    def load_csv_with_parquet_cache(csv_path, parquet_path, prepare, version):
+        """Without navigation_utils there is no Parquet copy, so read the CSV each time"""
+        return prepare(csv_path)
+
 # -------------------------------------------------------------------
 # BRANDING & THEME
 # -------------------------------------------------------------------
@@ -30,6 +34,9 @@ CYHAWK_RED_DARK = "#9A1529"
 if 'show_all_actors' not in st.session_state:
     st.session_state.show_all_actors = False
 
+def toggle_show_all():
+    st.session_state.show_all_actors = not st.session_state.show_all_actors
+
 # -------------------------------------------------------------------
 # CSS STYLES - DARK/LIGHT MODE ADAPTIVE
 # -------------------------------------------------------------------
@@ -45,24 +52,23 @@ def toggle_theme():
 CYHAWK_RED = "#C41E3A"
 CYHAWK_RED_DARK = "#9A1529"
 
-def theme_config():
-    if st.session_state.theme == "dark":
-        return {
-            "bg": "#0D1117",
-            "bg_secondary": "#161B22",
-            "card": "#1C2128",
-            "card_hover": "#22272E",
-            "border": "#30363D",
-            "text": "#E6EDF3",
-            "text_secondary": "#8B949E",
-            "text_muted": "#6E7681",
-            "accent": CYHAWK_RED,
-            "success": "#238636",
-            "warning": "#9E6A03",
-            "danger": "#DA3633",
-            "template": "plotly_dark"
-        }
-    return {
+THEMES = {
+    "dark": {
+        "bg": "#0D1117",
+        "bg_secondary": "#161B22",
+        "card": "#1C2128",
+        "card_hover": "#22272E",
+        "border": "#30363D",
+        "text": "#E6EDF3",
+        "text_secondary": "#8B949E",
+        "text_muted": "#6E7681",
+        "accent": CYHAWK_RED,
+        "success": "#238636",
+        "warning": "#9E6A03",
+        "danger": "#DA3633",
+        "template": "plotly_dark"
+    },
+    "light": {
         "bg": "#FFFFFF",
         "bg_secondary": "#F6F8FA",
         "card": "#FFFFFF",
@@ -76,9 +82,10 @@ def theme_config():
         "warning": "#9A6700",
         "danger": "#D1242F",
         "template": "plotly_white"
-    }
+    },
+}
 
-C = theme_config()
+C = THEMES[st.session_state.theme]
 
 # -------------------------------------------------------------------
 # HEADER
@@ -93,13 +100,24 @@ st.markdown("""
 # -------------------------------------------------------------------
 # DATA LOADING
 # -------------------------------------------------------------------
+# Parquet copy of this page's frame (the home page's sidecar drops more rows
+# and renames columns, so it gets a file of its own)
+ACTORS_PARQUET = "data/incidents_actors.parquet"
+ACTORS_PARQUET_VERSION = 1  # bump whenever clean_incidents() changes its columns or dtypes
+
+def clean_incidents(csv_path):
+    df = pd.read_csv(csv_path)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+    # Repeated labels as categoricals, so the per-actor groupby and
+    # nunique() calls work on integer codes rather than strings
+    return df.astype({"actor": "category", "country": "category", "threat_type": "category",
+                      "sector": "category", "severity": "category"})
+
 @st.cache_data
 def load_data():
     if os.path.exists("data/incidents.csv"):
-        df = pd.read_csv("data/incidents.csv")
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df = df.dropna(subset=["date"])
-        return df
+        return load_csv_with_parquet_cache("data/incidents.csv", ACTORS_PARQUET, clean_incidents, ACTORS_PARQUET_VERSION)
     return pd.DataFrame()
 
 # Ransomware intelligence fetching removed from this page for performance
@@ -107,6 +125,23 @@ def load_data():
 # -------------------------------------------------------------------
 # CLASSIFICATION FUNCTION (SAME AS ACTOR PROFILE PAGE)
 # -------------------------------------------------------------------
+# Name patterns, checked in order - built once, not per classified actor
+RANSOMWARE_KEYWORDS = ('ransomware', 'lockbit', 'revil', 'darkside', 'conti', 'maze', 'blackcat',
+                       'alphv', 'ryuk', 'nightspire', 'play', 'royal', 'medusa', 'funksec', 'ransom')
+IAB_KEYWORDS = ('bigbrother', 'broker', 'access', 'iab', 'initial')
+DB_KEYWORDS = ('b4bayega', 'database', 'breach', 'leak', 'dump', 'shinyh')
+
+ORIGIN_KEYWORDS = (
+    ('sudan', 'Sudan'),
+    ('anonymous sudan', 'Sudan (Disputed)'),
+    ('apt28', 'Russia'),
+    ('fancy bear', 'Russia'),
+    ('lazarus', 'North Korea'),
+    ('kimsuky', 'North Korea'),
+    ('china', 'China'),
+    ('iran', 'Iran'),
+)
+
 def classify_threat_actor_type(actor_name, actor_df, ransomware_intel=None):
     """
     Classify threat actor using same logic as Actor Profile page
@@ -152,17 +187,13 @@ def classify_threat_actor_type(actor_name, actor_df, ransomware_intel=None):
         return "Ransomware"
     
     # STEP 3: Check name patterns
-    ransomware_keywords = ['ransomware', 'lockbit', 'revil', 'darkside', 'conti', 'maze', 'blackcat', 
-                          'alphv', 'ryuk', 'nightspire', 'play', 'royal', 'medusa', 'funksec', 'ransom']
-    if any(kw in actor_lower for kw in ransomware_keywords):
+    if any(kw in actor_lower for kw in RANSOMWARE_KEYWORDS):
         return "Ransomware"
     
-    iab_keywords = ['bigbrother', 'broker', 'access', 'iab', 'initial']
-    if any(kw in actor_lower for kw in iab_keywords):
+    if any(kw in actor_lower for kw in IAB_KEYWORDS):
         return "Initial Access Broker (IAB)"
     
-    db_keywords = ['b4bayega', 'database', 'breach', 'leak', 'dump', 'shinyh']
-    if any(kw in actor_lower for kw in db_keywords):
+    if any(kw in actor_lower for kw in DB_KEYWORDS):
         return "Database Breach"
     
     # STEP 4: Default
@@ -174,19 +205,8 @@ def determine_origin(actor_name, actor_df):
         return "Unknown"
     
     # Check for known origins from name
-    origin_mapping = {
-        'sudan': 'Sudan',
-        'anonymous sudan': 'Sudan (Disputed)',
-        'apt28': 'Russia',
-        'fancy bear': 'Russia',
-        'lazarus': 'North Korea',
-        'kimsuky': 'North Korea',
-        'china': 'China',
-        'iran': 'Iran',
-    }
-    
     actor_lower = actor_name.lower()
-    for keyword, origin in origin_mapping.items():
+    for keyword, origin in ORIGIN_KEYWORDS:
         if keyword in actor_lower:
             return origin
     
@@ -237,46 +257,43 @@ def determine_threat_level(actor_name, total_attacks, countries, sectors, actor_
 # -------------------------------------------------------------------
 # LOAD AND PROCESS DATA
 # -------------------------------------------------------------------
-with st.spinner("Loading threat actor intelligence..."):
+@st.cache_data
+def load_actor_stats():
+    """Per-actor stats enriched with type, origin and threat level (filter-independent)"""
     df = load_data()
-
-if not df.empty:
+    
     # Calculate basic stats
-    stats = df.groupby("actor").agg(
+    groups = df.groupby("actor", observed=True)
+    stats = groups.agg(
         attacks=("date", "count"),
         countries=("country", "nunique"),
         sectors=("sector", "nunique")
     ).reset_index()
     
     # Enrich with auto-determined data (NO ransomware.live fetching here for speed)
-    enriched_data = []
-    
-    for _, row in stats.iterrows():
-        actor_name = row['actor']
-        actor_df = df[df['actor'] == actor_name]
-        
-        enriched_data.append({
-            'actor': actor_name,
-            'attacks': row['attacks'],
-            'countries': row['countries'],
-            'sectors': row['sectors'],
-            'type': classify_threat_actor_type(actor_name, actor_df, None),  # No ransomware intel
-            'origin': determine_origin(actor_name, actor_df),
-            'active': f"Since {determine_active_since(actor_df)}"
-        })
+    # One groupby pass hands each actor its rows instead of re-filtering df per actor
+    types, origins, active = [], [], []
+    for actor_name, actor_df in groups:
+        types.append(classify_threat_actor_type(actor_name, actor_df, None))  # No ransomware intel
+        origins.append(determine_origin(actor_name, actor_df))
+        active.append(f"Since {determine_active_since(actor_df)}")
     
-    stats = pd.DataFrame(enriched_data)
+    stats['type'] = types
+    stats['origin'] = origins
+    stats['active'] = active
     
     # Calculate threat levels
-    stats['threat_level'] = stats.apply(
-        lambda row: determine_threat_level(
-            row['actor'], 
-            row['attacks'], 
-            row['countries'], 
-            row['sectors'],
-            row['type']
-        ), axis=1
-    )
+    stats['threat_level'] = [
+        determine_threat_level(*row)
+        for row in zip(stats['actor'], stats['attacks'], stats['countries'], stats['sectors'], stats['type'])
+    ]
+    return stats
+
+with st.spinner("Loading threat actor intelligence..."):
+    df = load_data()
+
+if not df.empty:
+    stats = load_actor_stats()
 else:
     stats = pd.DataFrame(columns=["actor", "attacks", "countries", "sectors", "type", "origin", "active", "threat_level"])
     st.warning("⚠️ No incident data found. Please ensure data/incidents.csv exists and contains data.")
@@ -296,14 +313,14 @@ with f3:
     sort_by = st.selectbox("Sort By", ["Total Attacks", "Alphabetical"])
 
 with f4:
-    view_all_btn = st.button(
+    # Flipped in on_click, ahead of the rerun the click triggers anyway,
+    # so the label and grid update without a second st.rerun() pass
+    st.button(
         "View All Actors" if not st.session_state.show_all_actors else "Show Top 12",
         use_container_width=True,
-        type="primary"
+        type="primary",
+        on_click=toggle_show_all
     )
-    if view_all_btn:
-        st.session_state.show_all_actors = not st.session_state.show_all_actors
-        st.rerun()
 
 # -------------------------------------------------------------------
 # FILTER LOGIC
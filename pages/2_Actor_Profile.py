@@ -11,12 +11,12 @@ Features:
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import requests
 import os
 import json
+from collections import Counter
 from io import BytesIO
 
 # Optional PDF export (graceful fallback if not installed)
@@ -33,13 +33,14 @@ except ImportError:
 
 # Import navigation utilities
 try:
-    from navigation_utils import add_logo_and_branding, set_page_config as custom_set_page_config
+    from navigation_utils import add_font_links, add_logo_and_branding, set_page_config as custom_set_page_config
     custom_set_page_config(
         page_title="Actor Profile | CyHawk Africa",
         page_icon="assets/favicon.ico",
         layout="wide"
     )
     add_logo_and_branding()
+    add_font_links()
 except ImportError:
     st.set_page_config(
         page_title="Actor Profile | CyHawk Africa",
@@ -51,10 +52,17 @@ except ImportError:
 CYHAWK_RED = "#C41E3A"
 CYHAWK_RED_DARK = "#9A1529"
 
+# Trace style shared by the activity and ransomware victim timelines
+RED_LINE_TRACE = dict(type='scatter', mode='lines+markers', line=dict(color=CYHAWK_RED, width=3), showlegend=False)
+
+# Static footer markup - no per-actor data, so it is interpolated once at import
+BACK_LINK_HTML = f'<a href="/Threat_Actors" style="display: inline-block; padding: 0.75rem 1.5rem; background: transparent; color: {CYHAWK_RED}; border: 2px solid {CYHAWK_RED}; border-radius: 6px; text-decoration: none; font-weight: 600;">← Back</a>'
+
 # Adaptive CSS
-st.markdown(f"""
+# Style-only st.html goes to the event container: no layout element and no
+# markdown parse of the stylesheet on every run
+st.html(f"""
 <style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
 * {{ font-family: 'Inter', sans-serif; }}
 
 .profile-header {{
@@ -159,7 +167,7 @@ st.markdown(f"""
     font-size: 0.85rem;
 }}
 </style>
-""", unsafe_allow_html=True)
+""")
 
 # ============================================================================
 # DATA LOADING FUNCTIONS
@@ -536,16 +544,22 @@ def add_page_number_and_watermark(canvas, doc):
     
     canvas.restoreState()
 
-def generate_pdf_report(actor_name, profile_data, incidents_df, ransomware_data, risk_score, ttps):
+@st.cache_resource(show_spinner=False)
+def load_cover_logo(path):
+    """Cover logo thumbnail as PNG bytes, resized once per process instead of per report"""
+    from PIL import Image
+    img = Image.open(path)
+    img.thumbnail((200, 80), Image.Resampling.LANCZOS)
+    img_buffer = BytesIO()
+    img.save(img_buffer, format='PNG')
+    return img_buffer.getvalue()
+
+def generate_pdf_report(actor_name, profile_data, incidents_df, ransomware_data, risk_score, ttps, generated_at):
     """Generate strategic threat intelligence report with branding"""
     if not PDF_EXPORT_AVAILABLE:
         st.error("PDF export requires reportlab package. Install with: pip install reportlab")
         return None
     
-    from reportlab.lib.utils import ImageReader
-    import io
-    from PIL import Image, ImageDraw, ImageFont
-    
     buffer = BytesIO()
     
     # Create document with custom page template
@@ -611,15 +625,8 @@ def generate_pdf_report(actor_name, profile_data, incidents_df, ransomware_data,
     logo_path = "assets/cyhawk_logo.png"
     if os.path.exists(logo_path):
         try:
-            img = Image.open(logo_path)
-            # Resize logo to reasonable size
-            img.thumbnail((200, 80), Image.Resampling.LANCZOS)
-            img_buffer = BytesIO()
-            img.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            logo = ImageReader(img_buffer)
             from reportlab.platypus import Image as RLImage
-            logo_img = RLImage(img_buffer, width=200, height=80)
+            logo_img = RLImage(BytesIO(load_cover_logo(logo_path)), width=200, height=80)
             logo_img.hAlign = 'CENTER'
             story.append(logo_img)
             story.append(Spacer(1, 0.3*inch))
@@ -646,7 +653,7 @@ def generate_pdf_report(actor_name, profile_data, incidents_df, ransomware_data,
     
     # Report metadata table
     metadata = [
-        ['Report Generated:', datetime.now().strftime('%d %B %Y at %H:%M UTC')],
+        ['Report Generated:', generated_at],
         ['Threat Actor Type:', profile_data['type']],
         ['Risk Score:', f"{risk_score}/100 ({risk_class})"],
         ['Active Since:', profile_data['active_since']],
@@ -900,6 +907,12 @@ def generate_pdf_report(actor_name, profile_data, incidents_df, ransomware_data,
     buffer.seek(0)
     return buffer
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_pdf_report(actor_name, profile_data, incidents_df, ransomware_data, risk_score, ttps, generated_at):
+    """Threat brief PDF bytes, reused across export clicks for the same actor profile and minute"""
+    pdf_buffer = generate_pdf_report(actor_name, profile_data, incidents_df, ransomware_data, risk_score, ttps, generated_at)
+    return pdf_buffer.getvalue() if pdf_buffer else None
+
 # ============================================================================
 # MAIN PAGE
 # ============================================================================
@@ -984,11 +997,14 @@ with col1:
     if PDF_EXPORT_AVAILABLE:
         if st.button("📄 Export PDF", use_container_width=True):
             with st.spinner("Generating PDF..."):
-                pdf_buffer = generate_pdf_report(selected_actor, profile_data, actor_df, ransomware_data, risk_score, ttps)
-                if pdf_buffer:
+                # Timestamp taken here, not in the cached builder, so the brief
+                # never shows a generation time older than the current minute
+                generated_at = datetime.now().strftime('%d %B %Y at %H:%M UTC')
+                pdf_bytes = build_pdf_report(selected_actor, profile_data, actor_df, ransomware_data, risk_score, ttps, generated_at)
+                if pdf_bytes:
                     st.download_button(
                         label="⬇️ Download PDF",
-                        data=pdf_buffer,
+                        data=pdf_bytes,
                         file_name=f"CyHawk_ThreatBrief_{selected_actor}_{datetime.now().strftime('%Y%m%d')}.pdf",
                         mime="application/pdf",
                         use_container_width=True
@@ -1262,14 +1278,26 @@ if not actor_df.empty:
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.markdown('<h2 class="section-title">🌍 Targeted Countries</h2>', unsafe_allow_html=True)
     
-    country_stats = actor_df['country'].value_counts().head(10).reset_index()
-    country_stats.columns = ['Country', 'Incidents']
-    
-    fig_geo = px.bar(country_stats, x='Incidents', y='Country', orientation='h',
-                     title=f'Top 10 Countries Targeted by {selected_actor}')
-    fig_geo.update_traces(marker_color=CYHAWK_RED)
-    fig_geo.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400)
-    st.plotly_chart(fig_geo, use_container_width=True)
+    country_counts = actor_df['country'].value_counts().head(10)
+    
+    # One plain spec, validated once (px plus update_traces/update_layout ran three passes)
+    fig_geo = go.Figure(dict(
+        data=[dict(
+            type='bar',
+            x=country_counts.to_numpy(),
+            y=country_counts.index,
+            orientation='h',
+            marker=dict(color=CYHAWK_RED),
+            hovertemplate='Incidents=%{x}<br>Country=%{y}<extra></extra>'
+        )],
+        layout=dict(
+            title=dict(text=f'Top 10 Countries Targeted by {selected_actor}'),
+            height=400,
+            xaxis=dict(title=dict(text='Incidents')),
+            yaxis=dict(title=dict(text='Country'), categoryorder='total ascending')
+        )
+    ))
+    st.plotly_chart(fig_geo, width="stretch")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1281,13 +1309,21 @@ if not actor_df.empty:
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.markdown('<h2 class="section-title">🏢 Targeted Industries</h2>', unsafe_allow_html=True)
     
-    sector_stats = actor_df['sector'].value_counts().reset_index()
-    sector_stats.columns = ['Sector', 'Incidents']
-    
-    fig_sector = px.pie(sector_stats, values='Incidents', names='Sector',
-                       title=f'Industry Distribution', hole=0.4)
-    fig_sector.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig_sector, use_container_width=True)
+    sector_counts = actor_df['sector'].value_counts()
+    
+    fig_sector = go.Figure(dict(
+        data=[dict(
+            type='pie',
+            labels=sector_counts.index,
+            values=sector_counts.to_numpy(),
+            hole=0.4,
+            textposition='inside',
+            textinfo='percent+label',
+            hovertemplate='Sector=%{label}<br>Incidents=%{value}<extra></extra>'
+        )],
+        layout=dict(title=dict(text='Industry Distribution'))
+    ))
+    st.plotly_chart(fig_sector, width="stretch")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1331,26 +1367,26 @@ if ransomware_data and ransomware_data.get('victims'):
     
     # Aggregate victim statistics
     if victims:
-        victim_countries = {}
-        victim_sectors = {}
+        victim_countries = Counter()
+        victim_sectors = Counter()
         
         for victim in victims:
             country = victim.get('country', 'Unknown')
             if country != 'Unknown':
-                victim_countries[country] = victim_countries.get(country, 0) + 1
+                victim_countries[country] += 1
             
             # Try to infer sector from victim name/activity
             org_name = victim.get('post_title', '').lower()
             if any(word in org_name for word in ['bank', 'financial', 'credit']):
-                victim_sectors['Financial Services'] = victim_sectors.get('Financial Services', 0) + 1
+                victim_sectors['Financial Services'] += 1
             elif any(word in org_name for word in ['hospital', 'medical', 'health', 'clinic']):
-                victim_sectors['Healthcare'] = victim_sectors.get('Healthcare', 0) + 1
+                victim_sectors['Healthcare'] += 1
             elif any(word in org_name for word in ['school', 'university', 'college', 'education']):
-                victim_sectors['Education'] = victim_sectors.get('Education', 0) + 1
+                victim_sectors['Education'] += 1
             elif any(word in org_name for word in ['gov', 'government', 'municipal', 'city', 'county']):
-                victim_sectors['Government'] = victim_sectors.get('Government', 0) + 1
+                victim_sectors['Government'] += 1
             else:
-                victim_sectors['Other'] = victim_sectors.get('Other', 0) + 1
+                victim_sectors['Other'] += 1
         
         # Display victim statistics
         col1, col2 = st.columns(2)
@@ -1358,13 +1394,13 @@ if ransomware_data and ransomware_data.get('victims'):
         with col1:
             st.markdown("**Geographic Distribution:**")
             if victim_countries:
-                for country, count in sorted(victim_countries.items(), key=lambda x: x[1], reverse=True)[:5]:
+                for country, count in victim_countries.most_common(5):
                     st.markdown(f"- **{country}:** {count} victims")
         
         with col2:
             st.markdown("**Sector Targeting:**")
             if victim_sectors:
-                for sector, count in sorted(victim_sectors.items(), key=lambda x: x[1], reverse=True):
+                for sector, count in victim_sectors.most_common():
                     st.markdown(f"- **{sector}:** {count} victims")
     
     # Recent Victims Table
@@ -1402,28 +1438,31 @@ if ransomware_data and ransomware_data.get('victims'):
     if len(victims) > 1:
         st.markdown("### 📅 Attack Campaign Timeline")
         
-        # Parse dates and create timeline
-        victim_dates = []
-        for victim in victims:
-            discovered = victim.get('discovered', '')
-            if discovered and discovered != 'Unknown':
-                try:
-                    date_obj = pd.to_datetime(discovered)
-                    victim_dates.append(date_obj)
-                except:
-                    pass
+        # Parse dates and create timeline - one vectorized parse instead of
+        # a pd.to_datetime call per victim; unparseable dates are dropped
+        discovered = pd.Series([victim.get('discovered', '') for victim in victims])
+        discovered = discovered[(discovered != '') & (discovered != 'Unknown')]
+        victim_dates = pd.to_datetime(discovered, errors='coerce', format='mixed').dropna()
         
-        if victim_dates:
-            timeline_df = pd.DataFrame({'Date': victim_dates})
-            timeline_df['Count'] = 1
-            timeline_grouped = timeline_df.groupby(pd.Grouper(key='Date', freq='M')).sum().reset_index()
+        if not victim_dates.empty:
+            # Victims per month counted straight off the dates, no helper DataFrame
+            monthly_victims = pd.Series(1, index=pd.DatetimeIndex(victim_dates)).resample('MS').size()
             
-            if not timeline_grouped.empty:
-                fig_ransom_timeline = px.line(timeline_grouped, x='Date', y='Count',
-                                              title=f'{selected_actor} - Ransomware Victim Timeline',
-                                              labels={'Count': 'Victims', 'Date': 'Month'})
-                fig_ransom_timeline.update_traces(line_color=CYHAWK_RED, line_width=3, mode='lines+markers')
-                st.plotly_chart(fig_ransom_timeline, use_container_width=True)
+            if not monthly_victims.empty:
+                fig_ransom_timeline = go.Figure(dict(
+                    data=[dict(
+                        RED_LINE_TRACE,
+                        x=monthly_victims.index,
+                        y=monthly_victims.to_numpy(),
+                        hovertemplate='Month=%{x}<br>Victims=%{y}<extra></extra>'
+                    )],
+                    layout=dict(
+                        title=dict(text=f'{selected_actor} - Ransomware Victim Timeline'),
+                        xaxis=dict(title=dict(text='Month')),
+                        yaxis=dict(title=dict(text='Victims'))
+                    )
+                ))
+                st.plotly_chart(fig_ransom_timeline, width="stretch")
     
     # Threat Intelligence Summary
     st.markdown("### 🛡️ Defensive Intelligence")
@@ -1532,15 +1571,25 @@ if not actor_df.empty:
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.markdown('<h2 class="section-title">📈 Activity Timeline</h2>', unsafe_allow_html=True)
     
-    timeline = actor_df.groupby(actor_df['date'].dt.to_period('M')).size().reset_index()
+    # Month-start bins straight off the datetime64 column; quiet months show as 0
+    timeline = actor_df.set_index('date').resample('MS').size().reset_index()
     timeline.columns = ['Month', 'Incidents']
-    timeline['Month'] = timeline['Month'].dt.to_timestamp()
     
-    fig_timeline = px.line(timeline, x='Month', y='Incidents',
-                          title=f'{selected_actor} - Attack Frequency Over Time')
-    fig_timeline.update_traces(line_color=CYHAWK_RED, line_width=3, mode='lines+markers')
-    fig_timeline.update_layout(hovermode='x unified')
-    st.plotly_chart(fig_timeline, use_container_width=True)
+    fig_timeline = go.Figure(dict(
+        data=[dict(
+            RED_LINE_TRACE,
+            x=timeline['Month'],
+            y=timeline['Incidents'],
+            hovertemplate='Month=%{x}<br>Incidents=%{y}<extra></extra>'
+        )],
+        layout=dict(
+            title=dict(text=f'{selected_actor} - Attack Frequency Over Time'),
+            hovermode='x unified',
+            xaxis=dict(title=dict(text='Month')),
+            yaxis=dict(title=dict(text='Incidents'))
+        )
+    ))
+    st.plotly_chart(fig_timeline, width="stretch")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1581,6 +1630,6 @@ st.markdown('</div>', unsafe_allow_html=True)
 st.markdown("---")
 col1, col2 = st.columns([1, 5])
 with col1:
-    st.markdown(f'<a href="/Threat_Actors" style="display: inline-block; padding: 0.75rem 1.5rem; background: transparent; color: {CYHAWK_RED}; border: 2px solid {CYHAWK_RED}; border-radius: 6px; text-decoration: none; font-weight: 600;">← Back</a>', unsafe_allow_html=True)
+    st.markdown(BACK_LINK_HTML, unsafe_allow_html=True)
 with col2:
     st.success(f"✅ Threat intelligence report generated for {selected_actor}")
@@ -6,13 +6,14 @@ import re
 
 # Import navigation utilities
 try:
-    from navigation_utils import add_logo_and_branding, set_page_config as custom_set_page_config
+    from navigation_utils import add_font_links, add_logo_and_branding, set_page_config as custom_set_page_config
     custom_set_page_config(
         page_title="Top 3 Trending Attacks | CyHawk Africa",
         page_icon="assets/favicon.ico",
         layout="wide"
     )
     add_logo_and_branding()
+    add_font_links()
 except ImportError:
     st.set_page_config(
         page_title="Top 3 Trending Attacks | CyHawk Africa",
@@ -27,22 +28,21 @@ if 'theme' not in st.session_state:
 CYHAWK_RED = "#C41E3A"
 CYHAWK_RED_DARK = "#9A1529"
 
-def theme_config():
-    if st.session_state.theme == "dark":
-        return {
-            "bg": "#0D1117",
-            "bg_secondary": "#161B22",
-            "card": "#1C2128",
-            "card_hover": "#22272E",
-            "border": "#30363D",
-            "text": "#E6EDF3",
-            "text_secondary": "#8B949E",
-            "text_muted": "#6E7681",
-            "accent": CYHAWK_RED,
-            "success": "#238636",
-            "warning": "#9E6A03",
-        }
-    return {
+THEMES = {
+    "dark": {
+        "bg": "#0D1117",
+        "bg_secondary": "#161B22",
+        "card": "#1C2128",
+        "card_hover": "#22272E",
+        "border": "#30363D",
+        "text": "#E6EDF3",
+        "text_secondary": "#8B949E",
+        "text_muted": "#6E7681",
+        "accent": CYHAWK_RED,
+        "success": "#238636",
+        "warning": "#9E6A03",
+    },
+    "light": {
         "bg": "#FFFFFF",
         "bg_secondary": "#F6F8FA",
         "card": "#FFFFFF",
@@ -54,15 +54,15 @@ def theme_config():
         "accent": CYHAWK_RED,
         "success": "#1A7F37",
         "warning": "#9A6700",
-    }
+    },
+}
 
-C = theme_config()
+C = THEMES[st.session_state.theme]
 
 # CSS Styles - Simplified
-st.markdown(f"""
+# Stylesheet through st.html, as on the home page, so it is not run through the markdown renderer
+st.html(f"""
 <style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
-
 .main {{
     background-color: {C['bg']};
 }}
@@ -126,7 +126,7 @@ st.markdown(f"""
     gap: 0.5rem;
 }}
 </style>
-""", unsafe_allow_html=True)
+""")
 
 # Load blog posts from RSS feed
 @st.cache_data(ttl=1800)
@@ -230,18 +230,23 @@ def get_sample_attacks():
         }
     ]
 
-# Main Dashboard
-def main():
-    # Header
+# The timestamp only has minute resolution, so a one-minute cache is enough
+@st.cache_data(ttl=60, show_spinner=False)
+def header_html():
+    """Page header with the last-updated time"""
     current_time = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-    
-    st.markdown(f"""
+    return f"""
     <div class="trending-header">
         <h1 class="trending-title">Top 3 Trending Cyber Attacks</h1>
         <p class="trending-subtitle">Real-time threat intelligence from across Africa</p>
         <p class="trending-updated">Last Updated: {current_time}</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+# Main Dashboard
+def main():
+    # Header
+    st.markdown(header_html(), unsafe_allow_html=True)
     
     # Load attacks
     attacks = load_top_attacks_from_rss()